@@ -1,8 +1,82 @@
 import numpy as np
-import random
+import queue
 from sudoku_solver import SudokuSolver
 
 class SudokuGenerator:
+    # Solved grids prepared in the background by fill_solved_cache
+    CACHE_SIZE = 8
+    _solved_cache = queue.Queue(maxsize=CACHE_SIZE)
+
+    @staticmethod
+    def random_seeds(count):
+        """
+        Create boards whose three diagonal boxes hold random permutations
+        of 1-9. Those boxes share no row or column, so every seed can be
+        completed, and each one leads the solver to a different solution.
+        
+        Args:
+            count (int): Number of boards to create
+        
+        Returns:
+            numpy.ndarray: (count, 9, 9) int8 seed boards
+        """
+        seeds = np.zeros((count, 9, 9), dtype=np.int8)
+        boxes = np.argsort(np.random.rand(count, 3, 9), axis=2) + 1
+        
+        for box in range(3):
+            seeds[:, box*3:box*3+3, box*3:box*3+3] = boxes[:, box].reshape(count, 3, 3)
+        
+        return seeds
+
+    @staticmethod
+    def fill_solved_cache():
+        """
+        Keep the solved grid cache full, solving a whole batch of seed
+        boards every time it runs low. Blocks forever, so it is meant
+        to run in a daemon thread.
+        """
+        while True:
+            seeds = SudokuGenerator.random_seeds(SudokuGenerator.CACHE_SIZE)
+            for solved in SudokuSolver.solve_batch(seeds):
+                SudokuGenerator._solved_cache.put(SudokuGenerator.shuffle_solution(solved))
+
+    @staticmethod
+    def solved_grid():
+        """
+        Get a solved Sudoku grid, from the cache when one is ready.
+        
+        Returns:
+            numpy.ndarray: A solved 9x9 Sudoku grid
+        """
+        try:
+            return SudokuGenerator._solved_cache.get_nowait()
+        except queue.Empty:
+            solver = SudokuSolver(np.zeros((9, 9), dtype=int))
+            return SudokuGenerator.shuffle_solution(solver.solve_with_visualization(False))
+
+    @staticmethod
+    def shuffle_solution(grid):
+        """
+        Build a new solved Sudoku from an existing one using transformations
+        that keep it valid: permuting bands, stacks, rows within a band and
+        columns within a stack, transposing and relabeling the digits.
+        
+        Args:
+            grid (numpy.ndarray): A solved 9x9 Sudoku grid
+        
+        Returns:
+            numpy.ndarray: A different solved 9x9 Sudoku grid
+        """
+        rows = np.concatenate([band * 3 + np.random.permutation(3) for band in np.random.permutation(3)])
+        cols = np.concatenate([stack * 3 + np.random.permutation(3) for stack in np.random.permutation(3)])
+        shuffled = grid[np.ix_(rows, cols)]
+        
+        if np.random.rand() < 0.5:
+            shuffled = shuffled.T
+        
+        digits = np.random.permutation(np.arange(1, 10, dtype=np.int8))
+        return digits[shuffled - 1]
+
     @staticmethod
     def generate_puzzle(difficulty='medium'):
         """
@@ -12,37 +86,40 @@ class SudokuGenerator:
             difficulty (str): Difficulty level - 'easy', 'medium', 'hard', or 'expert'
         
         Returns:
-            numpy.ndarray: A 9x9 Sudoku puzzle with some cells removed
+            numpy.ndarray: A 9x9 Sudoku puzzle with a unique solution
         """
+        # Fraction of the 81 cells to remove. These are targets: cells are
+        # only removed while the solution stays unique, and a single pass
+        # over the grid usually stops around 55-59 removals. 'hard' may and
+        # 'expert' (64 removals, i.e. 17 clues) will return a puzzle with
+        # fewer cells removed, the most that pass could remove
         difficulty_settings = {
-            'easy': (0.3, 30),
-            'medium': (0.5, 40),
-            'hard': (0.7, 50),
-            'expert': (0.8, 60)
+            'easy': 0.3,
+            'medium': 0.5,
+            'hard': 0.7,
+            'expert': 0.8
         }
-        diff_param, max_attempts = difficulty_settings.get(difficulty, (0.5, 40))
-        
-        attempts = 0
-        while attempts < max_attempts:
-            # Create a fully solved Sudoku puzzle
-            base_puzzle = np.zeros((9, 9), dtype=int)
-            solver = SudokuSolver(base_puzzle)
-            solver.solve_with_visualization(False)
-            puzzle = solver.sudoku.copy()
-            
-            # Randomly remove cells
-            cells = [(i, j) for i in range(9) for j in range(9)]
-            random.shuffle(cells)
-            remove_count = int(81 * diff_param)
-            
-            for i, j in cells[:remove_count]:
-                puzzle[i][j] = 0
+        diff_param = difficulty_settings.get(difficulty, 0.5)
+        remove_count = int(81 * diff_param)
+        
+        # Create a fully solved Sudoku puzzle
+        puzzle = SudokuGenerator.solved_grid()
+        
+        # Randomly remove cells. Once every cell has been tried, no further
+        # cell can be removed, so another pass would not get any closer
+        removed = 0
+        for cell in np.random.permutation(81):
+            if removed == remove_count:
+                break
             
-            # Verify the puzzle has a unique solution
-            test_solver = SudokuSolver(puzzle)
-            if test_solver.solve_with_visualization(False) is not None:
-                return puzzle
+            i, j = divmod(cell, 9)
+            value = puzzle[i][j]
+            puzzle[i][j] = 0
             
-            attempts += 1
+            # Only keep the removal if the solution is still unique
+            if SudokuSolver(puzzle).count_solutions(2) == 1:
+                removed += 1
+            else:
+                puzzle[i][j] = value
         
-        raise Exception("Could not generate a valid Sudoku puzzle")
\ No newline at end of file
+        return puzzle
\ No newline at end of file
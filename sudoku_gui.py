@@ -3,11 +3,19 @@ from tkinter import messagebox, Scale
 import threading
 import queue
 import time
+import numpy as np
 
 from sudoku_solver import SudokuSolver
 from sudoku_generator import SudokuGenerator
 
 class SudokuGUI:
+    # Shortest time between two board repaints (about 60 frames per second)
+    FRAME_INTERVAL_MS = 16
+
+    # Alternating background colors that highlight the 3x3 boxes
+    _BG_A = '#E0E0FF'
+    _BG_B = '#FFFFFF'
+
     def __init__(self, master):
         """
         Initialize the Sudoku GUI.
@@ -20,9 +28,17 @@ class SudokuGUI:
         master.configure(bg='#f0f0f0')
         master.geometry("600x750")
         
-        self.cells = {}
+        # Entry widgets of the board, cell (i, j) at index i * 9 + j
+        self.cells = [None] * 81
         self.solving_speed = 0.1
         
+        # What update_board last painted, so unchanged cells can be skipped
+        self._prev_board = np.full((9, 9), -1)
+        self._prev_color = [None] * 81
+        
+        # Given cells of a generated puzzle, which the solver never changes
+        self._disabled = [False] * 81
+        
         self.create_board()
         self.create_controls()
         self.create_buttons()
@@ -30,7 +46,11 @@ class SudokuGUI:
         self.create_stats_label()
         
         self.update_queue = queue.Queue()
-        self.master.after(100, self.process_queue)
+        self.frame_interval = self.FRAME_INTERVAL_MS
+        self.master.after(self.frame_interval, self.process_queue)
+        
+        # Prepare solved grids so the Generate button does not wait on the solver
+        threading.Thread(target=SudokuGenerator.fill_solved_cache, daemon=True).start()
 
     def create_controls(self):
         """Create speed and difficulty control widgets."""
@@ -64,12 +84,15 @@ class SudokuGUI:
         for i in range(9):
             row = []
             for j in range(9):
-                val = self.cells[(i, j)].get()
+                val = self.cells[i * 9 + j].get()
                 row.append(int(val) if val.isdigit() else 0)
             sudoku.append(row)
         
+        # Cell contents may have been edited since the last paint
+        self.forget_painted_board()
+        
         try:
-            solver = SudokuSolver(sudoku, callback=self.update_board)
+            solver = SudokuSolver(sudoku, callback=self.queue_frame)
             solving_thread = threading.Thread(target=self.solve_thread, args=(solver,))
             solving_thread.start()
         except Exception as e:
@@ -86,19 +109,37 @@ class SudokuGUI:
         if solved is not None:
             self.update_queue.put(('solved', solved, solver.solve_time, solver.attempts, solver.backtrack_count))
         else:
-            self.update_queue.put(('error', None, None, None, None))
+            self.update_queue.put(('error',))
+
+    def queue_frame(self, board, **kwargs):
+        """
+        Solver callback: hand a board snapshot to the GUI thread.
+        
+        Args:
+            board (numpy.ndarray): Current Sudoku board state
+            **kwargs: Frame details passed on to update_board
+        """
+        self.update_queue.put(('frame', board, kwargs))
 
     def process_queue(self):
         """Process updates from solving thread."""
+        frame = None
         try:
             while not self.update_queue.empty():
-                status, solved, solve_time, attempts, backtrack_count = self.update_queue.get_nowait()
+                status, *payload = self.update_queue.get_nowait()
                 
+                if status == 'frame':
+                    # Only the most recent frame is worth painting
+                    frame = payload
+                    continue
+                
+                frame = None
                 if status == 'solved':
+                    solved, solve_time, attempts, backtrack_count = payload
                     for i in range(9):
                         for j in range(9):
-                            self.cells[(i, j)].delete(0, tk.END)
-                            self.cells[(i, j)].insert(0, str(solved[i][j]))
+                            self.cells[i * 9 + j].delete(0, tk.END)
+                            self.cells[i * 9 + j].insert(0, str(solved[i][j]))
                     
                     self.time_label.config(text=f"Solved in {solve_time:.4f} seconds")
                     self.stats_label.config(text=f"Attempts: {attempts}, Backtracks: {backtrack_count}")
@@ -109,7 +150,15 @@ class SudokuGUI:
         except queue.Empty:
             pass
         
-        self.master.after(100, self.process_queue)
+        if frame is not None:
+            # Leave the GUI at least twice the paint time between repaints
+            board, kwargs = frame
+            start = time.perf_counter()
+            self.update_board(board, **kwargs)
+            paint_ms = (time.perf_counter() - start) * 1000
+            self.frame_interval = max(self.FRAME_INTERVAL_MS, int(2 * paint_ms))
+        
+        self.master.after(self.frame_interval, self.process_queue)
 
     def update_board(self, board, status='normal', cell=None, number=None, attempts=0, backtrack_count=0):
         """
@@ -125,25 +174,36 @@ class SudokuGUI:
         """
         for i in range(9):
             for j in range(9):
-                try:
-                    base_color = '#E0E0FF' if (i // 3 + j // 3) % 2 == 0 else '#FFFFFF'
-                    
-                    if status == 'trying' and cell and cell == (i, j):
-                        base_color = '#FFD700'  # Gold for trying
-                    elif status == 'placed':
-                        base_color = '#90EE90'  # Light green for placed
-                    elif status == 'backtracking' and cell and cell == (i, j):
-                        base_color = '#FF6347'  # Tomato red for backtracking
-                    
-                    self.cells[(i, j)].delete(0, tk.END)
-                    if board[i][j] != 0:
-                        self.cells[(i, j)].insert(0, str(board[i][j]))
-                    
-                    self.cells[(i, j)].config(bg=base_color)
-                    self.stats_label.config(text=f"Attempts: {attempts}, Backtracks: {backtrack_count}")
+                index = i * 9 + j
+                if self._disabled[index]:
+                    continue
                 
-                except Exception:
-                    pass
+                base_color = self._BG_A if (i // 3 + j // 3) % 2 == 0 else self._BG_B
+                
+                if status == 'trying' and cell and cell == (i, j):
+                    base_color = '#FFD700'  # Gold for trying
+                elif status == 'placed':
+                    base_color = '#90EE90'  # Light green for placed
+                elif status == 'backtracking' and cell and cell == (i, j):
+                    base_color = '#FF6347'  # Tomato red for backtracking
+                
+                value = board[i][j]
+                if self._prev_board[i, j] != value:
+                    self.cells[index].delete(0, tk.END)
+                    if value != 0:
+                        self.cells[index].insert(0, str(value))
+                    self._prev_board[i, j] = value
+                
+                if self._prev_color[index] != base_color:
+                    self.cells[index].config(bg=base_color)
+                    self._prev_color[index] = base_color
+        
+        self.stats_label.config(text=f"Attempts: {attempts}, Backtracks: {backtrack_count}")
+
+    def forget_painted_board(self):
+        """Make the next update_board call repaint every cell."""
+        self._prev_board.fill(-1)
+        self._prev_color[:] = [None] * 81
 
     def generate_random_sudoku(self):
         """Generate a new random Sudoku puzzle."""
@@ -155,8 +215,9 @@ class SudokuGUI:
             for i in range(9):
                 for j in range(9):
                     if puzzle[i][j] != 0:
-                        self.cells[(i, j)].insert(0, str(puzzle[i][j]))
-                        self.cells[(i, j)].config(state='disabled', fg='#000080')
+                        self.cells[i * 9 + j].insert(0, str(puzzle[i][j]))
+                        self.cells[i * 9 + j].config(state='disabled', fg='#000080')
+                        self._disabled[i * 9 + j] = True
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -174,7 +235,7 @@ class SudokuGUI:
                                 borderwidth=3)
                 
                 # Alternate background colors to highlight 3x3 boxes
-                bg_color = '#E0E0FF' if (i // 3 + j // 3) % 2 == 0 else '#FFFFFF'
+                bg_color = self._BG_A if (i // 3 + j // 3) % 2 == 0 else self._BG_B
                 cell.configure(bg=bg_color, 
                                selectbackground='#4682B4', 
                                selectforeground='white')
@@ -185,7 +246,7 @@ class SudokuGUI:
                           pady=2 if i % 3 != 0 else 4, 
                           ipady=6)
                 
-                self.cells[(i, j)] = cell
+                self.cells[i * 9 + j] = cell
                 
                 # Validate input to ensure only digits 1-9
                 vcmd = (self.master.register(self.validate_input), '%P')
@@ -205,11 +266,13 @@ class SudokuGUI:
 
     def clear_board(self):
         """Reset the Sudoku board to initial state."""
-        for cell in self.cells.values():
-            cell.config(state='normal')
+        self.forget_painted_board()
+        self._disabled[:] = [False] * 81
+        for index, cell in enumerate(self.cells):
+            i, j = divmod(index, 9)
+            bg_color = self._BG_A if (i // 3 + j // 3) % 2 == 0 else self._BG_B
+            cell.config(state='normal', bg=bg_color)
             cell.delete(0, tk.END)
-            bg_color = '#E0E0FF' if (cell.grid_info()['row'] // 3 + cell.grid_info()['column'] // 3) % 2 == 0 else '#FFFFFF'
-            cell.config(bg=bg_color)
         
         self.time_label.config(text="")
         self.stats_label.config(text="Attempts: 0, Backtracks: 0")
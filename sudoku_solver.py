@@ -1,5 +1,342 @@
 import numpy as np
 import time
+from collections import deque
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when Numba is not installed."""
+        return lambda func: func
+
+# Candidate mask with all nine numbers still possible
+ALL_CANDIDATES = 0x1FF
+
+# Lookup tables over every possible candidate mask: how many numbers it
+# allows, and the smallest of them (0 for an empty mask)
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(ALL_CANDIDATES + 1)], dtype=np.int64)
+LOWEST_NUMBER = np.array([(mask & -mask).bit_length() for mask in range(ALL_CANDIDATES + 1)], dtype=np.int64)
+
+
+def _build_peers():
+    """
+    List the 20 peers of every cell: the 8 other cells of its row,
+    the 8 other cells of its column and the 4 remaining cells of its box.
+    
+    Returns:
+        tuple: (rows, cols) arrays of shape (9, 9, 20) with peer coordinates
+    """
+    rows = np.zeros((9, 9, 20), dtype=np.intp)
+    cols = np.zeros((9, 9, 20), dtype=np.intp)
+    
+    for i in range(9):
+        for j in range(9):
+            box_i, box_j = i // 3 * 3, j // 3 * 3
+            peers = [(i, k) for k in range(9) if k != j]
+            peers += [(k, j) for k in range(9) if k != i]
+            peers += [(r, c) for r in range(box_i, box_i + 3) for c in range(box_j, box_j + 3)
+                      if r != i and c != j]
+            rows[i, j] = [r for r, _ in peers]
+            cols[i, j] = [c for _, c in peers]
+    
+    return rows, cols
+
+
+PEER_ROWS, PEER_COLS = _build_peers()
+
+
+def _build_units():
+    """
+    List the cells of the 27 units: 9 rows, 9 columns and 9 boxes.
+    
+    Returns:
+        tuple: (rows, cols) arrays of shape (27, 9) with cell coordinates
+    """
+    units = [[(i, k) for k in range(9)] for i in range(9)]
+    units += [[(k, j) for k in range(9)] for j in range(9)]
+    units += [[(box // 3 * 3 + k // 3, box % 3 * 3 + k % 3) for k in range(9)] for box in range(9)]
+    
+    rows = np.array([[r for r, _ in unit] for unit in units], dtype=np.intp)
+    cols = np.array([[c for _, c in unit] for unit in units], dtype=np.intp)
+    return rows, cols
+
+
+UNIT_ROWS, UNIT_COLS = _build_units()
+
+# Shift of each number's bit, to split masks into one bit per number
+NUMBER_SHIFTS = np.arange(9, dtype=np.uint16)
+
+
+def popcount16(masks):
+    """
+    Count the candidates set in every mask of a uint16 array (SWAR popcount).
+    
+    Args:
+        masks (numpy.ndarray): uint16 candidate masks
+    
+    Returns:
+        numpy.ndarray: uint16 array of candidate counts
+    """
+    v = masks - ((masks >> 1) & 0x5555)
+    v = (v & 0x3333) + ((v >> 2) & 0x3333)
+    v = (v + (v >> 4)) & 0x0F0F
+    return (v * 0x0101) >> 8
+
+
+def initial_candidates(grids):
+    """
+    Build the candidate masks of a batch of grids, eliminating every known
+    number from its peers one number at a time.
+    
+    Args:
+        grids (numpy.ndarray): (B, 9, 9) int8 Sudoku grids
+    
+    Returns:
+        numpy.ndarray: (B, 9, 9) uint16 candidate masks
+    """
+    cands = np.full(grids.shape, ALL_CANDIDATES, dtype=np.uint16)
+    
+    for number in range(1, 10):
+        boards, rows, cols = np.nonzero(grids == number)
+        cands[boards[:, None], PEER_ROWS[rows, cols], PEER_COLS[rows, cols]] &= np.uint16(~(1 << (number-1)) & ALL_CANDIDATES)
+    cands[grids != 0] = 0
+    
+    return cands
+
+
+@njit(cache=True, boundscheck=False)
+def _is_solved(grid):
+    """Check if the grid is completely filled."""
+    for i in range(9):
+        for j in range(9):
+            if grid[i, j] == 0:
+                return False
+    return True
+
+
+@njit(cache=True, boundscheck=False)
+def _place_number(cand, grid, i, j, number):
+    """Place a number in a cell and clear it from the cell's peers."""
+    mask = ~(1 << (number - 1)) & ALL_CANDIDATES
+    grid[i, j] = number
+    cand[i, j] = 0
+    
+    for k in range(20):
+        cand[PEER_ROWS[i, j, k], PEER_COLS[i, j, k]] &= mask
+
+
+@njit(cache=True, boundscheck=False)
+def _hidden_single(cand):
+    """
+    Find a number that only one cell of some row, column or box can hold.
+    
+    Returns:
+        tuple: (flat index of the cell, number), or (-1, 0) if there is none
+    """
+    for unit in range(27):
+        once, more = 0, 0
+        for k in range(9):
+            mask = cand[UNIT_ROWS[unit, k], UNIT_COLS[unit, k]]
+            more |= once & mask
+            once |= mask
+        
+        hidden = once & ~more
+        if hidden:
+            number = LOWEST_NUMBER[hidden]
+            for k in range(9):
+                r, c = UNIT_ROWS[unit, k], UNIT_COLS[unit, k]
+                if (cand[r, c] >> (number - 1)) & 1:
+                    return r * 9 + c, number
+    
+    return -1, 0
+
+
+@njit(cache=True, boundscheck=False)
+def _trivial_moves(cand, grid, i, j):
+    """
+    Place every number that is the only option left for its cell (naked
+    single) or for its row, column or box (hidden single). Naked singles
+    are searched among the peers of cells placed since (i, j).
+    """
+    # Each placement queues its 20 peers, and there are at most 81 placements
+    pending = np.empty(81 * 20 + 20, dtype=np.int64)
+    head, tail = 0, 0
+    for k in range(20):
+        pending[tail] = PEER_ROWS[i, j, k] * 9 + PEER_COLS[i, j, k]
+        tail += 1
+    
+    while True:
+        while head < tail:
+            r, c = pending[head] // 9, pending[head] % 9
+            head += 1
+            
+            mask = cand[r, c]
+            if grid[r, c] == 0 and mask != 0 and mask & (mask - 1) == 0:
+                _place_number(cand, grid, r, c, LOWEST_NUMBER[mask])
+                
+                for k in range(20):
+                    pending[tail] = PEER_ROWS[r, c, k] * 9 + PEER_COLS[r, c, k]
+                    tail += 1
+        
+        # Naked singles are exhausted, look for a hidden single
+        cell, number = _hidden_single(cand)
+        if cell < 0:
+            return
+        
+        r, c = cell // 9, cell % 9
+        _place_number(cand, grid, r, c, number)
+        for k in range(20):
+            pending[tail] = PEER_ROWS[r, c, k] * 9 + PEER_COLS[r, c, k]
+            tail += 1
+
+
+@njit(cache=True, boundscheck=False)
+def _least_options_cell(cand, grid):
+    """
+    Select the empty cell with the least number of options.
+    
+    Returns:
+        int: Flat index of the cell, or -1 if no empty cells are left
+    """
+    best, best_count = -1, 10
+    
+    for i in range(9):
+        for j in range(9):
+            if grid[i, j] != 0:
+                continue
+            
+            count = POPCOUNT[cand[i, j]]
+            if count < best_count:
+                best, best_count = i * 9 + j, count
+                if count == 0:
+                    return best
+    
+    return best
+
+
+@njit(cache=True, boundscheck=False)
+def _number_ordering(cand, grid, i, j, order):
+    """
+    Write the candidates of a cell into order, most frequent in its
+    row, column and box first.
+    
+    Returns:
+        int: Number of candidates written
+    """
+    freq = np.zeros(10, dtype=np.int64)
+    for k in range(9):
+        freq[grid[i, k]] += 1
+        freq[grid[k, j]] += 1
+    
+    box_i, box_j = i // 3 * 3, j // 3 * 3
+    for k in range(3):
+        for l in range(3):
+            freq[grid[box_i + k, box_j + l]] += 1
+    
+    count = 0
+    mask = cand[i, j]
+    while mask:
+        number = LOWEST_NUMBER[mask]
+        mask &= mask - 1
+        
+        # Insertion sort keeps ties in ascending order
+        pos = count
+        while pos > 0 and freq[order[pos - 1]] < freq[number]:
+            order[pos] = order[pos - 1]
+            pos -= 1
+        order[pos] = number
+        count += 1
+    
+    return count
+
+
+@njit(cache=True, boundscheck=False)
+def _backtrack(cand, grid, stats, limit):
+    """
+    Iterative version of SudokuSolver.advanced_backtrack working on raw
+    candidate masks and grid, with an explicit stack of saved states.
+    
+    Args:
+        cand (numpy.ndarray): (9, 9) uint16 candidate masks, updated in place
+        grid (numpy.ndarray): (9, 9) int8 grid, updated in place
+        stats (numpy.ndarray): Receives [attempts, backtrack_count]
+        limit (int): Stop once this many solutions have been found
+    
+    Returns:
+        int: Number of solutions found, at most limit. When it reaches
+            limit, cand and grid hold the last solution found
+    """
+    # Every level places at least one number, so 81 levels are enough
+    saved_cand = np.empty((82, 9, 9), dtype=np.uint16)
+    saved_grid = np.empty((82, 9, 9), dtype=np.int8)
+    orders = np.zeros((82, 9), dtype=np.int64)
+    counts = np.zeros(82, dtype=np.int64)
+    tried = np.zeros(82, dtype=np.int64)
+    cells = np.zeros(82, dtype=np.int64)
+    
+    solutions = 0
+    depth = 0
+    descend = True
+    while True:
+        if descend:
+            descend = False
+            stats[0] += 1
+            tried[depth] = 0
+            if _is_solved(grid):
+                solutions += 1
+                if solutions >= limit:
+                    return solutions
+                # Keep searching for further solutions from the previous level
+                counts[depth] = 0
+            else:
+                cell = _least_options_cell(cand, grid)
+                cells[depth] = cell
+                counts[depth] = _number_ordering(cand, grid, cell // 9, cell % 9, orders[depth])
+                saved_cand[depth] = cand
+                saved_grid[depth] = grid
+        
+        if tried[depth] < counts[depth]:
+            # Place the next number and go one level deeper
+            number = orders[depth, tried[depth]]
+            tried[depth] += 1
+            i, j = cells[depth] // 9, cells[depth] % 9
+            _place_number(cand, grid, i, j, number)
+            _trivial_moves(cand, grid, i, j)
+            depth += 1
+            descend = True
+        else:
+            # Every number failed here, backtrack to the previous level
+            if depth == 0:
+                return solutions
+            depth -= 1
+            stats[1] += 1
+            cand[:, :] = saved_cand[depth]
+            grid[:, :] = saved_grid[depth]
+
+
+@njit(cache=True, boundscheck=False)
+def _solve_batch(cands, grids):
+    """
+    Run the compiled solver on every board of a batch in a single call.
+    
+    Args:
+        cands (numpy.ndarray): (B, 9, 9) uint16 candidate masks, updated in place
+        grids (numpy.ndarray): (B, 9, 9) int8 grids, solved in place
+    
+    Returns:
+        numpy.ndarray: Whether each board was solved
+    """
+    solved = np.zeros(len(grids), dtype=np.bool_)
+    stats = np.zeros(2, dtype=np.int64)
+    
+    for b in range(len(grids)):
+        solved[b] = _backtrack(cands[b], grids[b], stats, 1) > 0
+    
+    return solved
+
 
 class SudokuSolver:
     def __init__(self, sudoku, callback=None):
@@ -10,17 +347,13 @@ class SudokuSolver:
             sudoku (numpy.ndarray): Initial Sudoku grid
             callback (function, optional): Function to call during solving for visualization
         """
-        self.bitmap = np.ones((9, 9, 9), dtype=bool)
-        self.sudoku = np.zeros((9, 9), dtype=int)
+        self.sudoku = np.array(sudoku, dtype=np.int8)
+        # Bit k of each cell mask is set while number k+1 is still possible
+        self.cand = initial_candidates(self.sudoku[None])[0]
+        self._empty = int(np.count_nonzero(self.sudoku == 0))
         self.callback = callback
         self.attempts = 0
         self.backtrack_count = 0
-        
-        # Place initial known numbers
-        for i in range(9):
-            for j in range(9):
-                if sudoku[i][j] != 0:
-                    self.place_number(i, j, sudoku[i][j])
 
     def solve_with_visualization(self, visualize=True, delay=0.1):
         """
@@ -28,7 +361,7 @@ class SudokuSolver:
         
         Args:
             visualize (bool): Whether to use visualization
-            delay (float): Delay between solving steps
+            delay (float): Minimum time between frames sent to the callback
         
         Returns:
             numpy.ndarray or None: Solved Sudoku grid or None if no solution
@@ -37,55 +370,56 @@ class SudokuSolver:
         self.visualize = visualize
         self.attempts = 0
         self.backtrack_count = 0
+        self.last_frame = 0.0
         
         # Use the advanced backtracking method
-        result = self.advanced_backtrack_visualize(delay) if visualize else self.advanced_backtrack()
+        if visualize:
+            result = self.advanced_backtrack_visualize(delay)
+        elif HAS_NUMBA:
+            result = self.compiled_backtrack()
+        else:
+            result = self.advanced_backtrack()
         
         end = time.time()
         self.solve_time = end - start
         
         return result
 
+    @staticmethod
+    def solve_batch(grids):
+        """
+        Solve several Sudoku puzzles at once, sharing the setup work and
+        the call into the compiled solver across the whole batch.
+        
+        Args:
+            grids (numpy.ndarray): (B, 9, 9) array of Sudoku grids
+        
+        Returns:
+            list: Solved grid, or None if there is no solution, for each puzzle
+        """
+        grids = np.array(grids, dtype=np.int8)
+        
+        if not HAS_NUMBA:
+            return [SudokuSolver(grid).solve_with_visualization(False) for grid in grids]
+        
+        solved = _solve_batch(initial_candidates(grids), grids)
+        return [grid if ok else None for grid, ok in zip(grids, solved)]
+
     def advanced_least_options_cell(self):
         """
-        Select the cell with the least number of options 
-        and with the most strategic impact.
+        Select the empty cell with the least number of options
+        (minimum remaining values).
         
         Returns:
-            tuple: Coordinates of the strategic cell
-        """
-        # Create an impact matrix
-        impact_matrix = np.zeros((9, 9), dtype=float)
-        
-        for i in range(9):
-            for j in range(9):
-                if self.sudoku[i][j] == 0:
-                    # Count available options
-                    options_count = np.sum(self.bitmap[i][j])
-                    
-                    # Calculate impact based on empty spaces in row, column, and box
-                    row_empty = 9 - np.count_nonzero(self.sudoku[i, :])
-                    col_empty = 9 - np.count_nonzero(self.sudoku[:, j])
-                    
-                    # Calculate the 3x3 box
-                    box_i, box_j = i // 3 * 3, j // 3 * 3
-                    box_empty = 9 - np.count_nonzero(self.sudoku[box_i:box_i+3, box_j:box_j+3])
-                    
-                    # Calculate an impact score
-                    impact_score = (row_empty + col_empty + box_empty) / (options_count + 1)
-                    
-                    impact_matrix[i, j] = impact_score
-        
-        # Mask for empty cells
-        empty_cells_mask = self.sudoku == 0
-        
-        # If no empty cells, raise exception
-        if not np.any(empty_cells_mask):
-            raise ValueError("No empty cells left")
-        
-        # Find the cell with the highest strategic impact
-        impact_matrix[~empty_cells_mask] = -1
-        return np.unravel_index(np.argmax(impact_matrix), impact_matrix.shape)
+            tuple or None: Coordinates of the most constrained cell, or None
+                if no empty cells are left
+        """
+        if self._empty == 0:
+            return None
+        
+        counts = popcount16(self.cand)
+        counts[self.sudoku != 0] = 255
+        return divmod(int(counts.argmin()), 9)
 
     def smart_number_ordering(self, i, j):
         """
@@ -99,28 +433,23 @@ class SudokuSolver:
             list: Numbers ordered by probability of success
         """
         # Get possible numbers
-        possible_numbers = [num+1 for num in range(9) if self.bitmap[i][j][num]]
+        possible_numbers = [num+1 for num in range(9) if (self.cand[i, j] >> num) & 1]
         
         # Calculate frequency of numbers in row, column, and box
-        def number_frequency_score(number):
-            row_freq = np.sum(self.sudoku[i, :] == number)
-            col_freq = np.sum(self.sudoku[:, j] == number)
-            
-            # Calculate frequency in the 3x3 box
-            box_i, box_j = i // 3 * 3, j // 3 * 3
-            box_freq = np.sum(self.sudoku[box_i:box_i+3, box_j:box_j+3] == number)
-            
-            return -(row_freq + col_freq + box_freq)
+        box_i, box_j = i // 3 * 3, j // 3 * 3
+        freq = (np.bincount(self.sudoku[i, :], minlength=10)
+                + np.bincount(self.sudoku[:, j], minlength=10)
+                + np.bincount(self.sudoku[box_i:box_i+3, box_j:box_j+3].ravel(), minlength=10))
         
         # Sort numbers based on their frequency
-        return sorted(possible_numbers, key=number_frequency_score)
+        return sorted(possible_numbers, key=lambda number: -freq[number])
 
     def advanced_backtrack_visualize(self, delay=0.1):
         """
         Advanced backtracking method with intelligent cell and number selection.
         
         Args:
-            delay (float): Delay between solving steps
+            delay (float): Minimum time between frames sent to the callback
         
         Returns:
             numpy.ndarray or None: Solved Sudoku grid or None if no solution
@@ -130,36 +459,29 @@ class SudokuSolver:
         if self.is_solved():
             return self.sudoku
         
-        if self.callback and self.visualize:
-            self.callback(self.sudoku.copy(), status='searching', attempts=self.attempts, backtrack_count=self.backtrack_count)
-            time.sleep(delay)
+        self.emit_frame(delay, 'searching')
         
-        try:
-            # Use improved cell selection
-            i, j = self.advanced_least_options_cell()
-        except ValueError:
+        # Use improved cell selection
+        cell = self.advanced_least_options_cell()
+        if cell is None:
             return None
+        i, j = cell
         
         # Get intelligently ordered numbers
         numbers = self.smart_number_ordering(i, j)
         
         for number in numbers:
             if self.can_place_number(i, j, number):
-                # Save current state
-                curr_bitmap = self.bitmap.copy()
-                curr_sudoku = self.sudoku.copy()
+                # Record every change made in this branch so it can be undone
+                log = []
                 
-                if self.callback and self.visualize:
-                    self.callback(self.sudoku.copy(), status='trying', cell=(i, j), number=number, attempts=self.attempts, backtrack_count=self.backtrack_count)
-                    time.sleep(delay)
+                self.emit_frame(delay, 'trying', cell=(i, j), number=number)
                 
                 # Place number and perform trivial moves
-                self.place_number(i, j, number)
-                self.trivial_moves()
+                self.place_number(i, j, number, log)
+                self.trivial_moves(i, j, log)
                 
-                if self.callback and self.visualize:
-                    self.callback(self.sudoku.copy(), status='placed', attempts=self.attempts, backtrack_count=self.backtrack_count)
-                    time.sleep(delay)
+                self.emit_frame(delay, 'placed')
                 
                 # Recursively try to solve
                 result = self.advanced_backtrack_visualize(delay)
@@ -170,16 +492,33 @@ class SudokuSolver:
                 # Backtrack if no solution found
                 self.backtrack_count += 1
                 
-                if self.callback and self.visualize:
-                    self.callback(curr_sudoku.copy(), status='backtracking', cell=(i, j), attempts=self.attempts, backtrack_count=self.backtrack_count)
-                    time.sleep(delay)
-                
                 # Restore previous state
-                self.bitmap = curr_bitmap
-                self.sudoku = curr_sudoku
+                self.undo(log)
+                
+                self.emit_frame(delay, 'backtracking', cell=(i, j))
         
         return None
 
+    def emit_frame(self, delay, status, **kwargs):
+        """
+        Send the current board to the callback, skipping the frame if the
+        previous one was sent less than delay seconds ago.
+        
+        Args:
+            delay (float): Minimum time between frames
+            status (str): Current solving status
+            **kwargs: Extra frame details such as cell and number
+        """
+        if not (self.callback and self.visualize):
+            return
+        
+        now = time.perf_counter()
+        if now - self.last_frame < delay:
+            return
+        
+        self.last_frame = now
+        self.callback(self.sudoku.copy(), status=status, attempts=self.attempts, backtrack_count=self.backtrack_count, **kwargs)
+
     def advanced_backtrack(self):
         """
         Advanced backtracking method without visualization.
@@ -190,23 +529,22 @@ class SudokuSolver:
         if self.is_solved():
             return self.sudoku
         
-        try:
-            i, j = self.advanced_least_options_cell()
-        except ValueError:
+        cell = self.advanced_least_options_cell()
+        if cell is None:
             return None
+        i, j = cell
         
         # Get intelligently ordered numbers
         numbers = self.smart_number_ordering(i, j)
         
         for number in numbers:
             if self.can_place_number(i, j, number):
-                # Save current state
-                curr_bitmap = self.bitmap.copy()
-                curr_sudoku = self.sudoku.copy()
+                # Record every change made in this branch so it can be undone
+                log = []
                 
                 # Place number and perform trivial moves
-                self.place_number(i, j, number)
-                self.trivial_moves()
+                self.place_number(i, j, number, log)
+                self.trivial_moves(i, j, log)
                 
                 # Recursively try to solve
                 result = self.advanced_backtrack()
@@ -218,14 +556,78 @@ class SudokuSolver:
                 self.backtrack_count += 1
                 
                 # Restore previous state
-                self.bitmap = curr_bitmap
-                self.sudoku = curr_sudoku
+                self.undo(log)
         
         return None
 
+    def compiled_backtrack(self):
+        """
+        Advanced backtracking method run by the Numba-compiled solver.
+        
+        Returns:
+            numpy.ndarray or None: Solved Sudoku grid or None if no solution
+        """
+        stats = np.zeros(2, dtype=np.int64)
+        
+        # On failure the compiled solver leaves the grid as it found it
+        solved = _backtrack(self.cand, self.sudoku, stats, 1) > 0
+        if solved:
+            self._empty = 0
+        
+        self.attempts += int(stats[0])
+        self.backtrack_count += int(stats[1])
+        
+        return self.sudoku if solved else None
+
+    def count_solutions(self, limit=2):
+        """
+        Count the solutions of the Sudoku, stopping early at a limit.
+        
+        Args:
+            limit (int): Maximum number of solutions to look for
+        
+        Returns:
+            int: Number of solutions found, at most limit
+        """
+        if HAS_NUMBA:
+            stats = np.zeros(2, dtype=np.int64)
+            return int(_backtrack(self.cand.copy(), self.sudoku.copy(), stats, limit))
+        
+        return self.count_backtrack(limit)
+
+    def count_backtrack(self, limit):
+        """
+        Advanced backtracking method that keeps searching after a solution
+        until limit solutions are found. The grid is left unchanged.
+        
+        Args:
+            limit (int): Maximum number of solutions to look for
+        
+        Returns:
+            int: Number of solutions found, at most limit
+        """
+        if self.is_solved():
+            return 1
+        
+        i, j = self.advanced_least_options_cell()
+        count = 0
+        
+        for number in self.smart_number_ordering(i, j):
+            log = []
+            self.place_number(i, j, number, log)
+            self.trivial_moves(i, j, log)
+            
+            count += self.count_backtrack(limit - count)
+            self.undo(log)
+            
+            if count >= limit:
+                break
+        
+        return count
+
     def is_solved(self):
         """Check if the Sudoku is completely filled."""
-        return np.sum(self.sudoku == 0) == 0
+        return self._empty == 0
 
     def can_place_number(self, i, j, number):
         """
@@ -239,40 +641,91 @@ class SudokuSolver:
         Returns:
             bool: Whether the number can be placed
         """
-        return self.bitmap[i][j][number-1]
+        return bool((self.cand[i, j] >> (number-1)) & 1)
 
-    def place_number(self, i, j, number):
+    def place_number(self, i, j, number, log=None):
         """
-        Place a number in a specific cell and update bitmap.
+        Place a number in a specific cell and update the candidate masks.
         
         Args:
             i (int): Row index
             j (int): Column index
             number (int): Number to place
+            log (list, optional): Undo log receiving every change made
         """
+        peer_rows, peer_cols = PEER_ROWS[i, j], PEER_COLS[i, j]
+        
+        if log is not None:
+            # Fancy indexing already returns a copy of the peer masks
+            log.append((i, j, self.cand[i, j], self.cand[peer_rows, peer_cols]))
+        
+        if self.sudoku[i][j] == 0:
+            self._empty -= 1
+        
         self.sudoku[i][j] = number
-        self.bitmap[i][j] = np.zeros(9, dtype=bool)
+        self.cand[i, j] = 0
+        self.cand[peer_rows, peer_cols] &= np.uint16(~(1 << (number-1)) & ALL_CANDIDATES)
+
+    def undo(self, log):
+        """
+        Revert every placement recorded in an undo log, newest first.
         
-        # Eliminate number from same row and column
-        for k in range(9):
-            self.bitmap[i][k][number-1] = False
-            self.bitmap[k][j][number-1] = False
-        
-        # Eliminate number from 3x3 box
-        for k in range(3):
-            for l in range(3):
-                self.bitmap[i//3*3+k][j//3*3+l][number-1] = False
-
-    def trivial_moves(self):
-        """Perform trivial moves where only one option exists for a cell."""
-        changed = True
-        while changed:
-            changed = False
-            for i in range(9):
-                for j in range(9):
-                    if self.is_trivial_cell(i, j):
-                        changed = True
-                        self.place_number(i, j, np.argmax(self.bitmap[i][j]) + 1)
+        Args:
+            log (list): Entries (i, j, mask, peers) holding the cell mask
+                and peer masks saved before each placement
+        """
+        for i, j, mask, peers in reversed(log):
+            self.cand[PEER_ROWS[i, j], PEER_COLS[i, j]] = peers
+            self.cand[i, j] = mask
+            self.sudoku[i][j] = 0
+            self._empty += 1
+
+    def trivial_moves(self, i, j, log=None):
+        """
+        Perform trivial moves where only one option exists for a cell, or
+        where a number fits in only one cell of a row, column or box.
+        
+        Only peers of a newly placed number can lose options, so the search
+        for single-option cells starts from the peers of cell (i, j) and
+        follows each placement.
+        
+        Args:
+            i (int): Row of the cell just placed
+            j (int): Column of the cell just placed
+            log (list, optional): Undo log receiving every change made
+        """
+        pending = deque(zip(PEER_ROWS[i, j].tolist(), PEER_COLS[i, j].tolist()))
+        while pending:
+            i, j = pending.popleft()
+            if self.is_trivial_cell(i, j):
+                mask = int(self.cand[i, j])
+                self.place_number(i, j, (mask & -mask).bit_length(), log)
+                pending.extend(zip(PEER_ROWS[i, j].tolist(), PEER_COLS[i, j].tolist()))
+            
+            if not pending:
+                # Single-option cells are exhausted, look for a hidden single
+                single = self.hidden_single()
+                if single is not None:
+                    i, j, number = single
+                    self.place_number(i, j, number, log)
+                    pending.extend(zip(PEER_ROWS[i, j].tolist(), PEER_COLS[i, j].tolist()))
+
+    def hidden_single(self):
+        """
+        Find a number that only one cell of some row, column or box can hold.
+        
+        Returns:
+            tuple or None: (row, column, number), or None if there is none
+        """
+        # bits[unit, cell, number - 1] is set when that cell can hold number
+        bits = (self.cand[UNIT_ROWS, UNIT_COLS][:, :, None] >> NUMBER_SHIFTS) & 1
+        units, numbers = np.nonzero(bits.sum(axis=1) == 1)
+        if len(units) == 0:
+            return None
+        
+        unit, number = units[0], numbers[0]
+        k = bits[unit, :, number].argmax()
+        return int(UNIT_ROWS[unit, k]), int(UNIT_COLS[unit, k]), int(number) + 1
 
     def is_trivial_cell(self, i, j):
         """
@@ -285,4 +738,5 @@ class SudokuSolver:
         Returns:
             bool: Whether the cell has only one option
         """
-        return self.sudoku[i][j] == 0 and np.sum(self.bitmap[i][j]) == 1
\ No newline at end of file
+        mask = int(self.cand[i, j])
+        return self.sudoku[i][j] == 0 and mask != 0 and mask & (mask - 1) == 0
\ No newline at end of file